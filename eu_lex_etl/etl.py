@@ -1,28 +1,130 @@
-from typing import Literal
-import re
-import requests
-from bs4 import BeautifulSoup, Tag
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from datetime import timedelta
+from functools import cached_property
+from io import BytesIO
+from itertools import dropwhile
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Literal
+import asyncio
+import logging
+import os
+import string
+import tempfile
+import time
+import httpx
+import re2
+from lxml import etree
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 
 from . import schemas
 
+logger = logging.getLogger(__name__)
 
-def extract_documents(documents_names: list[str]) -> pd.DataFrame:
+
+def extract_documents(
+    documents_names: list[str],
+    max_workers: int | None = None,
+    cache_dir: Path | str | None = None,
+    use_cache: bool = True,
+) -> pd.DataFrame:
     """
     Extracts the EU directives text specified in the `documents_names` from
     the EUR-Lex website.
 
+    Unless `use_cache` is False, the fetched HTML pages are cached in `cache_dir`, by
+    default ".eurlex_cache" in the current working directory, and reused for 30 days.
+
     Args:
         documents_names (list[str]): A list of Directives names to extract.
+        max_workers (int | None): The maximum number of processes parsing the documents.
+            By default, batches of at least `ETL.PARALLEL_PARSING_MIN_DOCS` documents use
+            one process per CPU and smaller ones are parsed in the calling process. Use 1
+            to always parse in the calling process.
+        cache_dir (Path | str | None): The directory where the fetched HTML pages are
+            cached, defaulting to `ETL.CACHE_DIR`.
+        use_cache (bool): Whether to read and write the cache. When False, every page is
+            fetched and nothing is written to disk.
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the extracted data.
     """
-    df = ETL().run_routine(documents_names)
+    etl = ETL(cache_dir=cache_dir, use_cache=use_cache)
+    df = etl.run_routine(documents_names, max_workers=max_workers)
     return df
 
 
+def _parse_document(document_name: str, content: bytes) -> dict[str, list[str]]:
+    """
+    Parses the passages of a single EUR-Lex HTML page. Defined at module level so it
+    can be run in worker processes.
+
+    Args:
+        document_name (str): The name of the document the page belongs to.
+        content (bytes): The raw HTML page.
+
+    Returns:
+        dict[str, list[str]]: One list of values per `schemas.Record` field.
+    """
+    etl = ETL()
+    html_passages = etl._iter_html_passages(content)
+    return etl._parse_html_passages(document_name, html_passages)
+
+
+@dataclass
+class _PassageContext:
+    """
+    State carried from passage to passage while parsing a single document: the
+    current titles and marker, plus one list per `schemas.Record` field holding
+    the parsed passages.
+    """
+
+    heading: str = ""
+    section: str = ""
+    article: str = ""
+    article_subtitle: str = ""
+    ref: str = ""
+    prev_marker: bool = False
+
+    headings: list[str] = field(default_factory=list)
+    sections: list[str] = field(default_factory=list)
+    articles: list[str] = field(default_factory=list)
+    articles_subtitles: list[str] = field(default_factory=list)
+    texts: list[str] = field(default_factory=list)
+    refs: list[str] = field(default_factory=list)
+
+    def set_heading(self, text: str) -> None:
+        self.heading = text
+        self.section = ""
+        self.article = ""
+        self.article_subtitle = ""
+        self.ref = ""
+
+    def set_section(self, text: str) -> None:
+        self.section = text
+        self.article = ""
+        self.article_subtitle = ""
+        self.ref = ""
+
+    def set_article(self, text: str) -> None:
+        self.article = text
+        self.article_subtitle = ""
+        self.ref = ""
+
+    def set_article_subtitle(self, text: str) -> None:
+        self.article_subtitle = text
+
+    def add_passage(self, text: str) -> None:
+        self.headings.append(self.heading)
+        self.sections.append(self.section)
+        self.articles.append(self.article)
+        self.articles_subtitles.append(self.article_subtitle)
+        self.texts.append(text)
+        self.refs.append(self.ref)
+
+
 class ETL:
     """
     Class responsible for extracting EU directives text from the EUR-Lex website.
@@ -31,9 +133,17 @@ class ETL:
         BASE_EURLEX_URL (str): The base URL for the EUR-Lex website.
         DOC_TYPES_DESCRIPTORS (dict): A dictionary mapping the directive and regulation descriptors to their respective keys.
         CELEX_DIGIT_COUNT (int): The number of digits in the CELEX number.
-        _CSS_CLASSES_TO_IGNORE (list[str]): A list of CSS classes to ignore when parsing the HTML.
+        CACHE_DIR (Path): The default directory where the fetched HTML pages are cached, one file per CELEX id.
+        CACHE_MAX_AGE (timedelta): How long a cached HTML page is used before it is fetched again.
+        PARALLEL_PARSING_MIN_DOCS (int): The number of documents from which they are parsed in a pool of processes, when `max_workers` is not given.
+        _CSS_CLASSES_TO_IGNORE (frozenset[str]): The CSS classes to ignore when parsing the HTML.
+        _NORMAL_CSS_CLASSES (frozenset[str]): The CSS classes of the passages holding the documents' text.
+        _NUMBERED_CSS_CLASSES (tuple[str, ...]): The CSS classes that may come with a numbering suffix.
         _ISOLATED_MARKER_PATTERNS (list[str]): A list of patterns to identify an isolated marker.
         _STARTING_MARKER_PATTERNS (list[str]): A list of patterns to identify a sentence's starting marker.
+        _MARKER_FIRST_CHARS (frozenset[str]): The non-letter characters a marker may start with.
+        _MARKER_LETTERS (str): The letters matched by "[a-z]" in the case-insensitive marker patterns.
+        _MARKER_LETTERS_ENDINGS (frozenset[str]): The characters that may follow a marker's leading letters.
     """
 
     BASE_EURLEX_URL = "https://eur-lex.europa.eu/legal-content/PT/TXT/HTML/?uri=CELEX:"
@@ -42,124 +152,302 @@ class ETL:
         "R": ["regulation", "regulamento"],
     }
     CELEX_DIGIT_COUNT = 4
+    CACHE_DIR = Path(".eurlex_cache")
+    CACHE_MAX_AGE = timedelta(days=30)
+    PARALLEL_PARSING_MIN_DOCS = 50
 
-    _CSS_CLASSES_TO_IGNORE = ["signatory", "note"]
+    _CSS_CLASSES_TO_IGNORE = frozenset(["signatory", "note", "oj-signatory", "oj-note"])
+    _NORMAL_CSS_CLASSES = frozenset(["normal", "oj-normal"])
+    _NUMBERED_CSS_CLASSES = ("doc-ti", "ti-section")
 
     # Patterns to identify an isolated marker, i.e., no sentence follows it ============= #
     _ISOLATED_MARKER_PATTERNS = [
-        "([0-9]+\.)+$",  # 1.1.
-        "([0-9]+\.)+\-[a-z]\.$",  # 1.1.-a.
-        "([0-9]+\.)+\-[a-z]\)$",  # 1.1.-a)
-        "\([0-9]+\)$",  # (12)
-        "[0-9]+\)$",  # 12)
-        "\([a-z]+\)$",  # (a) OR (A)
-        "[a-z]+\)$",  # a) OR A)
-        "[0-9]+\.$",  # 1.
-        "[a-z]+\.$",  # a.
-        "—$",  # —
-        "[0-9]+\-[a-z]\)$",  # 1-a)
-        "[0-9]+\-[a-z]\.$",  # 1-a.
-        "[a-z]+\-[a-z]\)$",  # a-a)
+        r"([0-9]+\.)+$",  # 1.1.
+        r"([0-9]+\.)+\-[a-z]\.$",  # 1.1.-a.
+        r"([0-9]+\.)+\-[a-z]\)$",  # 1.1.-a)
+        r"\([0-9]+\)$",  # (12)
+        r"[0-9]+\)$",  # 12)
+        r"\([a-z]+\)$",  # (a) OR (A)
+        r"[a-z]+\)$",  # a) OR A)
+        r"[0-9]+\.$",  # 1.
+        r"[a-z]+\.$",  # a.
+        r"—$",  # —
+        r"[0-9]+\-[a-z]\)$",  # 1-a)
+        r"[0-9]+\-[a-z]\.$",  # 1-a.
+        r"[a-z]+\-[a-z]\)$",  # a-a)
     ]
 
     # Patterns to identify a sentence's starting marker ================================= #
     _STARTING_MARKER_PATTERNS = [
-        "[0-9]+\.[0-9]+\-[a-z]\.",  # 1.2-a.  <sentence>
-        "[0-9]+\.[0-9]+\-[a-z]\)",  # 1.2-a)  <sentence>
-        "[0-9]+\-[a-z]\.",  # 4-a.  <sentence>
-        "[0-9]+\-[a-z]\)",  # 4-a)  <sentence>
-        "[0-9]+\-[a-z]\s+",  # 4-A  <sentence>
-        "[0-9]+[a-z]\.\s+",  # 4A.  <sentence>
-        "([0-9]+\.)+",  # 1.2.  <sentence>
-        "\([0-9]+\)",  # (12)  <sentence>
-        "[0-9]+\)",  # 12)  <sentence>
-        "\([a-z]+\)",  # (a)  <sentence>
-        "[a-z]+\)",  # a)  <sentence>
-        "[0-9]+\.",  # 12.  <sentence>
-        "[0-9]+\s+",  # 12  <sentence>
-        "[a-z]+\.",  # a.  <sentence>
+        r"[0-9]+\.[0-9]+\-[a-z]\.",  # 1.2-a.  <sentence>
+        r"[0-9]+\.[0-9]+\-[a-z]\)",  # 1.2-a)  <sentence>
+        r"[0-9]+\-[a-z]\.",  # 4-a.  <sentence>
+        r"[0-9]+\-[a-z]\)",  # 4-a)  <sentence>
+        r"[0-9]+\-[a-z]\s+",  # 4-A  <sentence>
+        r"[0-9]+[a-z]\.\s+",  # 4A.  <sentence>
+        r"([0-9]+\.)+",  # 1.2.  <sentence>
+        r"\([0-9]+\)",  # (12)  <sentence>
+        r"[0-9]+\)",  # 12)  <sentence>
+        r"\([a-z]+\)",  # (a)  <sentence>
+        r"[a-z]+\)",  # a)  <sentence>
+        r"[0-9]+\.",  # 12.  <sentence>
+        r"[0-9]+\s+",  # 12  <sentence>
+        r"[a-z]+\.",  # a.  <sentence>
     ]
 
-    @property
-    def isolated_marker_pattern(self) -> re.Pattern:
+    # Character rules every marker follows, checked before any regex matching =========== #
+    _MARKER_FIRST_CHARS = frozenset(f"{string.digits}(—")
+    # The Kelvin sign and the long s case-fold to ASCII letters as well
+    _MARKER_LETTERS = f"{string.ascii_letters}\u212a\u017f"
+    _MARKER_LETTERS_ENDINGS = frozenset(").-")
+
+    @cached_property
+    def isolated_marker_pattern(self):
         """
         Returns a compiled regular expression pattern that matches isolated markers.
 
         An isolated marker is a marker that appears alone in a line, without any other text.
+        The pattern is compiled once per instance with RE2, which matches in linear time
+        regardless of the number of alternatives.
 
         Returns:
-            A compiled regular expression pattern that matches isolated markers.
+            A compiled RE2 pattern, as returned by `re2.compile`, that matches isolated
+            markers.
         """
         pattern_ = self._build_patterns_list(ETL._ISOLATED_MARKER_PATTERNS)
-        return re.compile(pattern_, flags=re.IGNORECASE)
+        return re2.compile(f"(?i){pattern_}")
 
-    @property
-    def starting_marker_pattern(self) -> re.Pattern:
+    @cached_property
+    def starting_marker_pattern(self):
         """
         Returns a compiled regular expression pattern that matches the starting markers
-        used in the ETL process.
+        used in the ETL process. The pattern is compiled once per instance with RE2.
 
         Returns:
-            A compiled regular expression pattern.
+            A compiled RE2 pattern, as returned by `re2.compile`.
         """
         pattern_ = self._build_patterns_list(ETL._STARTING_MARKER_PATTERNS)
-        return re.compile(pattern_, flags=re.IGNORECASE)
+        return re2.compile(f"(?i){pattern_}")
 
     def _build_patterns_list(self, patterns_list: list[str]) -> str:
-        pattern_ = ""
-        for sub_pattern_ in patterns_list:
-            pattern_ += f"|^{sub_pattern_}"
-            pattern_ += (
-                f"|^«{sub_pattern_}"  # Duplicate pattern, adding a leading "«" symbol
-            )
-        pattern_ = pattern_[1:]  # Remove leading "|"
-        return pattern_
-
-    @property
-    def css_classes_to_ignore(self) -> list[str]:
-        return [
-            *ETL._CSS_CLASSES_TO_IGNORE,
-            *[f"oj-{name}" for name in ETL._CSS_CLASSES_TO_IGNORE],
-        ]
+        # Single anchor shared by all sub-patterns, each allowing a leading "«" symbol
+        sub_patterns_ = "|".join(patterns_list)
+        return f"^«?(?:{sub_patterns_})"
+
+    @cached_property
+    def passage_handlers(self) -> dict[str, Callable[[_PassageContext, str], None]]:
+        """
+        Returns the handlers of each kind of passage, keyed by their CSS class without
+        the "oj-" prefix or any numbering suffix.
+
+        Returns:
+            A dictionary mapping a CSS class to the function handling its passages.
+        """
+        return {
+            "doc-ti": _PassageContext.set_heading,
+            "ti-section": _PassageContext.set_section,
+            "ti-art": _PassageContext.set_article,
+            "sti-art": _PassageContext.set_article_subtitle,
+            "normal": self._handle_normal_passage,
+        }
+
+    def __init__(
+        self, cache_dir: Path | str | None = None, use_cache: bool = True
+    ) -> None:
+        """
+        Args:
+            cache_dir (Path | str | None): The directory where the fetched HTML pages are
+                cached, defaulting to `ETL.CACHE_DIR`.
+            use_cache (bool): Whether to read and write the cache. When False, every page
+                is fetched and nothing is written to disk.
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else ETL.CACHE_DIR
+        self.use_cache = use_cache
 
-    def run_routine(self, documents_names: list[str]) -> pd.DataFrame:
+    def run_routine(
+        self, documents_names: list[str], max_workers: int | None = None
+    ) -> pd.DataFrame:
         """
         Runs the routine to extract the EU directives text specified in the
         `documents_names` from the EUR-Lex website.
 
         Args:
             documents_names (list[str]): A list of Directives names to extract.
+            max_workers (int | None): The maximum number of processes parsing the documents.
+                By default, batches of at least `PARALLEL_PARSING_MIN_DOCS` documents use one
+                process per CPU and smaller ones are parsed in the calling process. Use 1 to
+                always parse in the calling process.
 
         Returns:
             pd.DataFrame: A pandas DataFrame containing the extracted data.
         """
         docs_params = self._build_docs_params(documents_names)
+        celex_ids = [
+            self._build_celex_id(**asdict(doc_params)) for doc_params in docs_params
+        ]
 
-        dfs_list = []
+        columns = {record_field.name: [] for record_field in fields(schemas.Record)}
+        texts_docs_ids = []
         print("🚀 Starting extraction...\n")
-        for i, doc_params in enumerate(tqdm(docs_params)):
-            url = self._build_url(**doc_params)
+        contents = self._load_documents(celex_ids)
+
+        docs_columns = self._parse_documents(documents_names, contents, max_workers)
+
+        for doc_columns in docs_columns:
+            for name, values in doc_columns.items():
+                columns[name].extend(values)
+            texts_docs_ids.extend(range(len(doc_columns["text"])))
+
+        # Arrow-backed strings are stored contiguously rather than as Python objects
+        df = pd.DataFrame(
+            data={
+                "text_id": np.arange(len(texts_docs_ids), dtype=np.int64),
+                "text_doc_id": np.array(texts_docs_ids, dtype=np.int64),
+                **{
+                    name: pd.array(values, dtype="string[pyarrow]")
+                    for name, values in columns.items()
+                },
+            }
+        )
+        print("\nExtraction concluded successfully 🎉")
+        return df
+
+    def _parse_documents(
+        self,
+        documents_names: list[str],
+        contents: list[bytes],
+        max_workers: int | None = None,
+    ) -> list[dict[str, list[str]]]:
+        """
+        Parses the HTML page of each document. Documents are independent, so they can be
+        spread over a pool of processes. Unless `max_workers` says otherwise, only batches
+        of at least `PARALLEL_PARSING_MIN_DOCS` documents are, since a page only takes
+        tens of milliseconds to parse in the calling process.
+
+        Args:
+            documents_names (list[str]): A list of Directives names.
+            contents (list[bytes]): The raw HTML pages, in the same order.
+            max_workers (int | None): The maximum number of processes, defaulting to the
+                number of CPUs for large batches and to 1 for small ones. Use 1 to parse in
+                the calling process.
+
+        Returns:
+            list[dict[str, list[str]]]: One list of values per `schemas.Record` field,
+                for each document.
+        """
+        if max_workers is None:
+            if len(contents) < ETL.PARALLEL_PARSING_MIN_DOCS:
+                max_workers = 1
+            else:
+                max_workers = os.cpu_count() or 1
+
+        max_workers = min(len(contents), max_workers)
+        if max_workers <= 1:
+            return [
+                self._parse_html_passages(name, self._iter_html_passages(content))
+                for name, content in zip(documents_names, contents)
+            ]
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_parse_document, documents_names, contents))
+
+    def _load_documents(self, celex_ids: list[str]) -> list[bytes]:
+        """
+        Loads the HTML page of each document. Pages cached in `cache_dir` for less than
+        `CACHE_MAX_AGE` are read from disk; the others are fetched from the EUR-Lex
+        website and cached. With `use_cache` off, every page is fetched.
+
+        Args:
+            celex_ids (list[str]): A list of the documents' CELEX ids.
+
+        Returns:
+            list[bytes]: The raw HTML pages, in the same order as `celex_ids`.
+        """
+        cache_paths = [self.cache_dir / f"{celex_id}.html" for celex_id in celex_ids]
+        min_mtime = time.time() - ETL.CACHE_MAX_AGE.total_seconds()
 
-            response = requests.get(url)
+        contents = []
+        for path in cache_paths:
+            is_fresh = (
+                self.use_cache and path.is_file() and path.stat().st_mtime > min_mtime
+            )
+            contents.append(path.read_bytes() if is_fresh else None)
+
+        missing = [i for i, content in enumerate(contents) if content is None]
+        if not missing:
+            return contents
+
+        urls = [f"{ETL.BASE_EURLEX_URL}{celex_ids[i]}" for i in missing]
+        responses = self._run_fetch_all(urls)
+
+        if self.use_cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for i, response in zip(missing, responses):
             assert (
                 response.status_code == 200
-            ), f"The HTTP request failed for {doc_params.doc_type}:{doc_params.doc_year}/{doc_params.doc_number}."
+            ), f"The HTTP request failed for CELEX:{celex_ids[i]}."
 
-            html = BeautifulSoup(response.content.decode(), "html.parser")
-            html_passages = html.find_all("p")
-            records = self._parse_html_passages(documents_names[i], html_passages)
+            if self.use_cache:
+                self._write_cache(cache_paths[i], response.content)
+            contents[i] = response.content
+        return contents
 
-            df_ = pd.DataFrame(data=records)
-            df_ = df_.drop(
-                index=df_[(df_.text == "") & (df_.ref == "")].index
-            ).reset_index(drop=True)
-            dfs_list.append(df_)
+    def _write_cache(self, path: Path, content: bytes) -> None:
+        """
+        Writes a page to the cache atomically: it goes to a temporary file first, which
+        then replaces `path`, so an interrupted run never leaves a truncated page behind.
 
-        df = pd.concat(dfs_list)
-        df = df.reset_index(names="text_doc_id")
-        df = df.reset_index(names="text_id")
-        print("\nExtraction concluded successfully 🎉")
-        return df
+        Args:
+            path (Path): The page's path in the cache.
+            content (bytes): The raw HTML page.
+        """
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_file.write(content)
+        os.replace(tmp_file.name, path)
+
+    def _run_fetch_all(self, urls: list[str]) -> list[httpx.Response]:
+        """
+        Runs `_fetch_all` to completion. When called from a running event loop (e.g.
+        in Jupyter), it is run in a separate thread with its own loop, since
+        `asyncio.run` cannot be nested.
+
+        Args:
+            urls (list[str]): A list of URLs to fetch.
+
+        Returns:
+            list[httpx.Response]: The responses, in the same order as `urls`.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._fetch_all(urls))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._fetch_all(urls)).result()
+
+    async def _fetch_all(self, urls: list[str]) -> list[httpx.Response]:
+        """
+        Fetches all the given URLs concurrently. The requests share a small
+        pool of HTTP/2 connections to the EUR-Lex host, and failed connection
+        attempts are retried.
+
+        Args:
+            urls (list[str]): A list of URLs to fetch.
+
+        Returns:
+            list[httpx.Response]: The responses, in the same order as `urls`.
+        """
+        transport = httpx.AsyncHTTPTransport(
+            http2=True, retries=3, limits=httpx.Limits(max_connections=4)
+        )
+        async with httpx.AsyncClient(
+            transport=transport, timeout=30.0, follow_redirects=True
+        ) as client:
+            return await tqdm_asyncio.gather(
+                *(client.get(url) for url in urls), total=len(urls)
+            )
 
     def _build_docs_params(self, documents_names: list[str]) -> list[schemas.DocParams]:
         """
@@ -189,7 +477,7 @@ class ETL:
             ), f"Doc type's alias not found in existing mapping for document '{doc}'"
 
             docs_params.append(
-                dict(
+                schemas.DocParams(
                     doc_sector=3,
                     doc_year=doc_nums[0],
                     doc_number=doc_nums[1],
@@ -198,109 +486,141 @@ class ETL:
             )
         return docs_params
 
-    def _build_url(
+    def _build_celex_id(
         self,
         doc_year: int,
         doc_number: int,
         doc_sector: int = 3,
         doc_type: Literal["L", "R"] = "L",
     ) -> str:
-        doc_number_proxy = str(doc_number)
-        prefix_zeros = ""
-        for _ in range(ETL.CELEX_DIGIT_COUNT - len(doc_number_proxy)):
-            prefix_zeros += "0"
+        doc_number_proxy = f"{int(doc_number):0{ETL.CELEX_DIGIT_COUNT}d}"
+        return f"{doc_sector}{doc_year}{doc_type}{doc_number_proxy}"
 
-        doc_number_proxy = f"{prefix_zeros}{doc_number_proxy}"
-        return (
-            f"{ETL.BASE_EURLEX_URL}{doc_sector}{doc_year}{doc_type}{doc_number_proxy}"
+    def _iter_html_passages(self, content: bytes) -> Iterator[tuple[list[str], str]]:
+        """
+        Streams the passages ("p" tags) of an HTML page while it is being parsed. Each
+        passage is discarded once yielded, together with everything preceding it in the
+        document, so only the not yet streamed part of the tree is held in memory.
+
+        Args:
+            content (bytes): The raw HTML page.
+
+        Yields:
+            tuple[list[str], str]: The CSS classes and the text of each passage.
+        """
+        passages = etree.iterparse(
+            BytesIO(content), tag="p", html=True, encoding="utf-8"
         )
+        for _, element in passages:
+            css_classes = element.get("class", "").split()
+            if css_classes:
+                yield css_classes, "".join(element.itertext())
+            element.clear(keep_tail=True)
+
+            # Drop the preceding siblings of the passage and of each of its ancestors
+            ancestor = element
+            while (parent := ancestor.getparent()) is not None:
+                while ancestor.getprevious() is not None:
+                    del parent[0]
+                ancestor = parent
 
     def _parse_html_passages(
-        self, document_name: str, html_passages: list[Tag]
-    ) -> list[schemas.Record]:
-        # recover_heading = False
-        heading = ""
-        section = ""
-        article = ""
-        article_subtitle = ""
-        ref = ""
-        prev_marker = False
-        records = []
-
-        # Loop to retrieve the first 'normal' passage
-        for i, tag in enumerate(html_passages):
-            if tag["class"][0] in ["normal", "oj-normal"]:
-                break
-
-        for tag in html_passages[i:]:
-            assert type(tag["class"]) == list, "The CSS class attr is not a list"
+        self, document_name: str, html_passages: Iterable[tuple[list[str], str]]
+    ) -> dict[str, list[str]]:
+        context = _PassageContext()
+
+        # Skip the passages preceding the first 'normal' one
+        html_passages = dropwhile(
+            lambda passage: passage[0][0] not in ETL._NORMAL_CSS_CLASSES,
+            html_passages,
+        )
 
+        for css_classes, raw_text in html_passages:
             # For now, simply notify a passage has more than one CSS class.
             # Nonetheless, the conditional ignores additional classes.
-            if len(tag["class"]) != 1:
-                print(
-                    f"More than one CSS class found in doc: {document_name} --> passage: {tag.text}"
+            if len(css_classes) != 1:
+                logger.debug(
+                    "More than one CSS class found in doc: %s --> passage: %s %s",
+                    document_name,
+                    raw_text,
+                    css_classes,
                 )
-                print(tag["class"])
 
-            if tag["class"][0] in self.css_classes_to_ignore:
+            css_class = css_classes[0]
+            if css_class in ETL._CSS_CLASSES_TO_IGNORE:
                 continue
 
-            text = tag.text.strip()
-            text = re.sub(pattern="(\xa0)+", repl=" ", string=text)
-
-            if tag["class"][0].startswith("doc-ti") or tag["class"][0].startswith(
-                "oj-doc-ti"
-            ):
-                heading = text
-                section = ""
-                article = ""
-                article_subtitle = ""
-                ref = ""
-
-            if tag["class"][0].startswith("ti-section") or tag["class"][0].startswith(
-                "oj-ti-section"
-            ):
-                section = text
-                article = ""
-                article_subtitle = ""
-                ref = ""
-
-            elif tag["class"][0] in ["ti-art", "oj-ti-art"]:
-                article = text
-                article_subtitle = ""
-                ref = ""
-
-            elif tag["class"][0] in ["sti-art", "oj-sti-art"]:
-                article_subtitle = text
-
-            elif tag["class"][0] in ["normal", "oj-normal"]:
-                if self.isolated_marker_pattern.match(text):
-                    ref = text
-                    prev_marker = True
-                    continue
-
-                elif marker_match := self.starting_marker_pattern.match(text):
-                    ref = marker_match.group()
-                    text = text.replace(ref, "").strip()
-
-                elif not prev_marker:
-                    ref = ""
-
-                records.append(
-                    {
-                        "document": document_name,
-                        "heading": heading,
-                        "section": section,
-                        "article": article,
-                        "article_subtitle": article_subtitle,
-                        "text": text,
-                        "ref": ref,
-                    }
+            # Handlers are keyed by the class name shared by the "oj-" and numbered variants
+            css_class = css_class.removeprefix("oj-")
+            if css_class.startswith(ETL._NUMBERED_CSS_CLASSES):
+                css_class = next(
+                    name
+                    for name in ETL._NUMBERED_CSS_CLASSES
+                    if css_class.startswith(name)
                 )
-                prev_marker = False
 
-        return records
+            handler = self.passage_handlers.get(css_class)
+            if handler is None:
+                continue
+
+            # Splitting on any whitespace (including "\xa0") also collapses and strips it
+            text = " ".join(raw_text.split())
+            handler(context, text)
+
+        return {
+            "document": [document_name] * len(context.texts),
+            "heading": context.headings,
+            "section": context.sections,
+            "article": context.articles,
+            "article_subtitle": context.articles_subtitles,
+            "text": context.texts,
+            "ref": context.refs,
+        }
+
+    def _may_have_marker(self, text: str) -> bool:
+        """
+        Tells whether a passage may start with a marker, judging by its leading characters
+        only. Passages for which it returns False cannot match any of the marker patterns.
+
+        After an optional "«", a marker starts either with a digit, "(" or "—", or with a
+        run of letters followed by ")", "." or "-".
+
+        Args:
+            text (str): The passage's text.
+
+        Returns:
+            bool: Whether the marker patterns should be matched against the passage.
+        """
+        text = text.removeprefix("«")
+        if text[:1] in ETL._MARKER_FIRST_CHARS:
+            return True
+
+        text_after_letters = text.lstrip(ETL._MARKER_LETTERS)
+        return (
+            len(text_after_letters) < len(text)
+            and text_after_letters[:1] in ETL._MARKER_LETTERS_ENDINGS
+        )
+
+    def _handle_normal_passage(self, context: _PassageContext, text: str) -> None:
+        may_have_marker = self._may_have_marker(text)
+        if may_have_marker and self.isolated_marker_pattern.match(text):
+            context.ref = text
+            context.prev_marker = True
+            return
+
+        elif may_have_marker and (
+            marker_match := self.starting_marker_pattern.match(text)
+        ):
+            context.ref = marker_match.group()
+            text = text.replace(context.ref, "").strip()
+
+        elif not context.prev_marker:
+            context.ref = ""
+
+        # Passages with neither text nor marker are left out
+        if text or context.ref:
+            context.add_passage(text)
+        context.prev_marker = False
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocParams:
     doc_sector: int
     doc_year: str
@@ -9,7 +9,7 @@ class DocParams:
     doc_type: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Record:
     document: str
     heading: str
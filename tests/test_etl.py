@@ -0,0 +1,255 @@
+import os
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+import pytest
+import re2
+
+from eu_lex_etl import etl as etl_module
+from eu_lex_etl.etl import ETL
+
+# Shapes of the markers holding a letter, "{}" standing for the letter
+LETTER_MARKER_SHAPES = [
+    "{}.",
+    "{})",
+    "({})",
+    "{}-{})",
+    "1-{})",
+    "1-{}.",
+    "1-{} texto",
+    "4{}. texto",
+    "1.2-{}.",
+    "1.2-{})",
+    "1.1.-{})",
+]
+
+HTML_PAGE = """
+<html><head><meta charset="UTF-8"></head><body><div>
+<p class="oj-hd-date">1.1.2019</p>
+<p class="oj-doc-ti">DIRETIVA (UE) 2019/770</p>
+<p class="oj-normal">O PARLAMENTO EUROPEU E O CONSELHO,</p>
+<p class="oj-note">(1) JO C 264</p>
+<p class="oj-doc-ti">ANEXO</p>
+<p class="oj-ti-section-1">CAPÍTULO I</p>
+<p class="oj-ti-art">Artigo 1.o</p>
+<p class="oj-sti-art">Objeto</p>
+<p class="oj-normal">1.</p>
+<p class="oj-normal">Os Estados-Membros\xa0asseguram  que</p>
+<p class="oj-normal">a) o profissional fornece;</p>
+<p class="oj-normal">«2. Consumidor», qualquer pessoa;</p>
+<p class="oj-normal">(12)</p>
+<p class="oj-normal"> </p>
+<p class="oj-normal oj-bold">Texto corrido.</p>
+<p class="oj-ti-art">Artigo 2.o</p>
+<p class="oj-normal">4-A Serviço digital</p>
+<p class="oj-signatory">Pelo Parlamento Europeu</p>
+<p class="oj-normal">Feito em Bruxelas.</p>
+<p>Sem classe</p>
+</div></body></html>
+"""
+
+
+@pytest.fixture(scope="module")
+def etl() -> ETL:
+    return ETL()
+
+
+def test_marker_letters_are_the_letters_matched_by_the_patterns() -> None:
+    letter_pattern = re2.compile("(?i)[a-z]")
+
+    # Only the characters whose case mappings reach an ASCII letter can fold onto one
+    candidates = set()
+    for code_point in range(sys.maxunicode + 1):
+        char = chr(code_point)
+        for mapped_char in (char.lower(), char.upper(), char.casefold()):
+            if len(mapped_char) == 1 and mapped_char in string.ascii_letters:
+                candidates.add(char)
+
+    matched_letters = {char for char in candidates if letter_pattern.fullmatch(char)}
+    assert matched_letters == set(ETL._MARKER_LETTERS)
+
+
+@pytest.mark.parametrize("prefix", ["", "«"])
+@pytest.mark.parametrize("letter", ["a", "Z", "\u212a", "\u017f"])
+@pytest.mark.parametrize("shape", LETTER_MARKER_SHAPES)
+def test_may_have_marker_accepts_letter_markers(
+    etl: ETL, shape: str, letter: str, prefix: str
+) -> None:
+    text = prefix + shape.format(letter, letter)
+
+    assert etl.isolated_marker_pattern.match(text) or etl.starting_marker_pattern.match(
+        text
+    )
+    assert etl._may_have_marker(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "O PARLAMENTO EUROPEU E O CONSELHO,",
+        "Os Estados-Membros asseguram que",
+        "Feito em Bruxelas.",
+        "«Consumidor», qualquer pessoa;",
+    ],
+)
+def test_may_have_marker_rejects_sentences(etl: ETL, text: str) -> None:
+    assert not etl.isolated_marker_pattern.match(text)
+    assert not etl.starting_marker_pattern.match(text)
+    assert not etl._may_have_marker(text)
+
+
+@pytest.mark.parametrize(
+    "text", ["1.", "«1.1.", "(a)", "iv) texto", "4-A texto", "K) texto", "—"]
+)
+def test_may_have_marker_accepts_markers(etl: ETL, text: str) -> None:
+    assert etl._may_have_marker(text)
+
+
+def test_parse_html_passages(etl: ETL) -> None:
+    html_passages = etl._iter_html_passages(HTML_PAGE.encode("utf-8"))
+    columns = etl._parse_html_passages("Diretiva (UE) 2019/770", html_passages)
+
+    assert columns == {
+        "document": ["Diretiva (UE) 2019/770"] * 8,
+        "heading": ["", *["ANEXO"] * 7],
+        "section": ["", *["CAPÍTULO I"] * 7],
+        "article": ["", *["Artigo 1.o"] * 5, *["Artigo 2.o"] * 2],
+        "article_subtitle": ["", *["Objeto"] * 5, "", ""],
+        "text": [
+            "O PARLAMENTO EUROPEU E O CONSELHO,",
+            "Os Estados-Membros asseguram que",
+            "o profissional fornece;",
+            "Consumidor», qualquer pessoa;",
+            "",
+            "Texto corrido.",
+            "Serviço digital",
+            "Feito em Bruxelas.",
+        ],
+        "ref": ["", "1.", "a)", "«2.", "(12)", "", "4-A ", ""],
+    }
+
+
+def test_parse_documents_in_pool_matches_serial(
+    etl: ETL, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    documents_names = ["Diretiva (UE) 2019/770", "Diretiva (UE) 2019/771"]
+    contents = [
+        HTML_PAGE.encode("utf-8"),
+        HTML_PAGE.replace("Objeto", "Âmbito").encode("utf-8"),
+    ]
+    pools = []
+
+    class RecordingProcessPoolExecutor(ProcessPoolExecutor):
+        def __init__(self, max_workers: int) -> None:
+            super().__init__(max_workers=max_workers)
+            pools.append(max_workers)
+
+    monkeypatch.setattr(etl_module, "ProcessPoolExecutor", RecordingProcessPoolExecutor)
+
+    serial_columns = etl._parse_documents(documents_names, contents, max_workers=1)
+    pool_columns = etl._parse_documents(documents_names, contents, max_workers=8)
+
+    # An explicit max_workers is honoured below PARALLEL_PARSING_MIN_DOCS, capped to the
+    # number of documents
+    assert pools == [2]
+    assert pool_columns == serial_columns
+
+
+def test_parse_documents_small_batch_in_process_by_default(
+    etl: ETL, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("A process pool was started")
+
+    monkeypatch.setattr(etl_module, "ProcessPoolExecutor", fail)
+
+    docs_columns = etl._parse_documents(
+        ["Diretiva (UE) 2019/770"] * 2, [b"<p></p>"] * 2
+    )
+    assert len(docs_columns) == 2
+
+
+CELEX_ID = "32019L0770"
+
+
+def patch_fetch(
+    monkeypatch: pytest.MonkeyPatch, etl: ETL, status_code: int = 200
+) -> list[str]:
+    fetched_urls = []
+
+    async def fetch_all(urls: list[str]) -> list[httpx.Response]:
+        fetched_urls.extend(urls)
+        return [
+            httpx.Response(
+                status_code, content=b"fetched", request=httpx.Request("GET", url)
+            )
+            for url in urls
+        ]
+
+    monkeypatch.setattr(etl, "_fetch_all", fetch_all)
+    return fetched_urls
+
+
+def test_load_documents_reads_fresh_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    etl = ETL(cache_dir=tmp_path)
+    fetched_urls = patch_fetch(monkeypatch, etl)
+    (tmp_path / f"{CELEX_ID}.html").write_bytes(b"cached")
+
+    assert etl._load_documents([CELEX_ID]) == [b"cached"]
+    assert fetched_urls == []
+
+
+def test_load_documents_fetches_stale_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    etl = ETL(cache_dir=tmp_path)
+    fetched_urls = patch_fetch(monkeypatch, etl)
+    cache_path = tmp_path / f"{CELEX_ID}.html"
+    cache_path.write_bytes(b"cached")
+    stale_mtime = time.time() - ETL.CACHE_MAX_AGE.total_seconds() - 60
+    os.utime(cache_path, (stale_mtime, stale_mtime))
+
+    assert etl._load_documents([CELEX_ID]) == [b"fetched"]
+    assert fetched_urls == [f"{ETL.BASE_EURLEX_URL}{CELEX_ID}"]
+    assert cache_path.read_bytes() == b"fetched"
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_load_documents_caches_fetched_pages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmp_path / "cache"
+    etl = ETL(cache_dir=cache_dir)
+    patch_fetch(monkeypatch, etl)
+
+    assert etl._load_documents([CELEX_ID]) == [b"fetched"]
+    assert sorted(path.name for path in cache_dir.iterdir()) == [f"{CELEX_ID}.html"]
+
+
+def test_load_documents_does_not_cache_failed_requests(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    etl = ETL(cache_dir=tmp_path)
+    patch_fetch(monkeypatch, etl, status_code=404)
+
+    with pytest.raises(AssertionError, match=CELEX_ID):
+        etl._load_documents([CELEX_ID])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_load_documents_without_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_dir = tmp_path / "cache"
+    etl = ETL(cache_dir=cache_dir, use_cache=False)
+    fetched_urls = patch_fetch(monkeypatch, etl)
+
+    assert etl._load_documents([CELEX_ID]) == [b"fetched"]
+    assert fetched_urls == [f"{ETL.BASE_EURLEX_URL}{CELEX_ID}"]
+    assert not cache_dir.exists()